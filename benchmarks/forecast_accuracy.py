@@ -0,0 +1,97 @@
+# --- benchmarks/forecast_accuracy.py (fast engine vs RandomForest + polynomial blend) ---
+# Rolling-origin backtest on synthetic daily expense ledgers: each origin fits
+# both engines on the history up to that day and scores the next 7 days.
+#
+#   python benchmarks/forecast_accuracy.py [--days 365] [--origins 8] [--json out.json]
+
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+import forecasting
+
+HORIZON = 7
+
+# name -> (base, weekend lift, trend per day, noise std, share of zero-spend days)
+PROFILES = {
+    'flat': (60.0, 0.0, 0.0, 15.0, 0.0),
+    'weekly': (50.0, 40.0, 0.0, 10.0, 0.0),
+    'trend': (40.0, 15.0, 0.15, 10.0, 0.0),
+    'noisy': (60.0, 20.0, 0.0, 45.0, 0.0),
+    'sparse': (80.0, 30.0, 0.0, 25.0, 0.4),
+}
+
+def synthetic_ledger(profile, n_days, seed):
+    base, weekend, trend, noise, zero_share = PROFILES[profile]
+    rng = np.random.default_rng(seed)
+    dates = [date(2023, 1, 2) + timedelta(days=i) for i in range(n_days)]
+    weekend_flag = np.array([d.weekday() >= 5 for d in dates], dtype=float)
+    totals = base + weekend * weekend_flag + trend * np.arange(n_days) + rng.normal(0, noise, n_days)
+    totals = np.maximum(totals, 0.0)
+    totals[rng.random(n_days) < zero_share] = 0.0
+    return dates, totals
+
+def fit_predict_rf(dates, totals):
+    # Same path as app.train_forecast: only days with spend reach the model
+    daily = pd.DataFrame({'date': dates, 'total_amount': totals})
+    daily = forecasting.add_daily_features(daily[daily['total_amount'] > 0].reset_index(drop=True))
+    return forecasting.predict_forecast(forecasting.train_forecast_models(daily), HORIZON)
+
+def fit_predict_fast(dates, totals):
+    return forecasting.predict_fast(forecasting.fit_fast(dates, totals), HORIZON)
+
+ENGINES = {'rf': fit_predict_rf, 'fast': fit_predict_fast}
+
+def backtest(profile, n_days, n_origins, seed):
+    dates, totals = synthetic_ledger(profile, n_days, seed)
+    return backtest_series(dates, totals, n_origins)
+
+def backtest_series(dates, totals, n_origins):
+    # dates/totals: one entry per consecutive day, zero-spend days included.
+    # Origins are spread over the second half of the history.
+    n_days = len(dates)
+    actual_by_date = {d.strftime('%Y-%m-%d'): t for d, t in zip(dates, totals)}
+    origins = np.linspace(n_days // 2, n_days - HORIZON, n_origins).astype(int)
+    results = {}
+    for engine, fit_predict in ENGINES.items():
+        errors, seconds = [], []
+        for origin in origins:
+            started = time.perf_counter()
+            forecast = fit_predict(dates[:origin], totals[:origin])
+            seconds.append(time.perf_counter() - started)
+            errors.extend(abs(row['predicted_amount'] - actual_by_date[row['date']]) for row in forecast)
+        results[engine] = {
+            'mae': float(np.mean(errors)),
+            'fit_ms': float(np.median(seconds) * 1000)
+        }
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Backtest the forecast engines on synthetic ledgers")
+    parser.add_argument('--days', type=int, default=365, help='history length per ledger')
+    parser.add_argument('--origins', type=int, default=8, help='rolling origins per ledger')
+    parser.add_argument('--seed', type=int, default=7)
+    parser.add_argument('--json', help='also write the results to this file')
+    args = parser.parse_args()
+
+    report = {'days': args.days, 'origins': args.origins, 'horizon': HORIZON, 'profiles': {}}
+    print(f"{'profile':<8} {'rf MAE':>9} {'fast MAE':>9} {'rf fit ms':>10} {'fast fit ms':>12}")
+    for i, profile in enumerate(PROFILES):
+        result = backtest(profile, args.days, args.origins, args.seed + i)
+        report['profiles'][profile] = result
+        print(f"{profile:<8} {result['rf']['mae']:>9.2f} {result['fast']['mae']:>9.2f} "
+              f"{result['rf']['fit_ms']:>10.1f} {result['fast']['fit_ms']:>12.2f}")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,218 @@
+# --- benchmarks/loadtest.py (HTTP load test for the Flask API) ---
+# Drives the API from a pool of client threads and reports latency
+# percentiles and throughput per endpoint. Without --url it seeds a synthetic
+# ledger into a throwaway SQLite database and serves app.py from a threaded
+# werkzeug server in this process; --test-client skips the socket layer and
+# calls the app through Flask's test client instead.
+#
+#   python benchmarks/loadtest.py [--transactions 100000] [--concurrency 8] [--duration 10]
+#   python benchmarks/loadtest.py --url http://127.0.0.1:5000 --scenarios transactions,advisor
+
+import argparse
+import json
+import logging
+import random
+import shutil
+import threading
+import time
+from collections import defaultdict
+from datetime import timedelta
+
+import numpy as np
+import requests
+
+from synthetic import EXPENSE_CATEGORIES, FIRST_DAY, ledger_span, load_backend, report_header, seed_ledger
+
+def add_payload(rng, n_days):
+    return {
+        "type": "Expense",
+        "category": rng.choice(EXPENSE_CATEGORIES),
+        "amount": round(rng.uniform(2, 120), 2),
+        "description": "load test",
+        "date": (FIRST_DAY + timedelta(days=rng.randrange(n_days))).isoformat()
+    }
+
+def budget_payload(rng, n_days):
+    return {"category": rng.choice(EXPENSE_CATEGORIES), "limit": round(rng.uniform(100, 1000), 2)}
+
+# name -> (method, path, payload factory)
+ENDPOINTS = {
+    'add': ('POST', '/add', add_payload),
+    'transactions': ('GET', '/transactions', None),
+    'summary': ('GET', '/transactions/summary', None),
+    'budget': ('GET', '/budget', None),
+    'budget_set': ('POST', '/budget', budget_payload),
+    'budget_progress': ('GET', '/budget/progress', None),
+    'forecast': ('GET', '/forecast', None),
+    'forecast_fast': ('GET', '/forecast?engine=fast', None),
+    'forecast_batch': ('GET', '/forecast/batch?horizon=30', None),
+    'advisor': ('GET', '/advisor', None),
+}
+
+# Read-heavy traffic with a steady trickle of writes, weights in percent
+MIXED_WEIGHTS = {
+    'transactions': 35, 'summary': 10, 'budget': 5, 'budget_progress': 10,
+    'forecast': 10, 'advisor': 10, 'add': 18, 'budget_set': 2
+}
+
+# Half writers, half long aggregate reads: the workload that hits SQLite's lock
+CONTENTION_WEIGHTS = {'add': 50, 'summary': 25, 'transactions': 25}
+
+# CPU-bound batch forecasts alongside short reads and writes: the reads'
+# latency shows whether analytics starve the I/O endpoints
+ANALYTICS_WEIGHTS = {'forecast_batch': 20, 'add': 10, 'transactions': 35, 'summary': 20, 'budget': 15}
+
+MIXES = {'mixed': MIXED_WEIGHTS, 'contention': CONTENTION_WEIGHTS, 'analytics': ANALYTICS_WEIGHTS}
+DEFAULT_SCENARIOS = list(ENDPOINTS) + list(MIXES)
+
+class HttpClient:
+    def __init__(self, base_url):
+        self.base_url = base_url.rstrip('/')
+        self.session = requests.Session()
+
+    def request(self, method, path, payload):
+        response = self.session.request(method, self.base_url + path, json=payload, timeout=60)
+        return response.status_code
+
+class TestClient:
+    def __init__(self, app):
+        self.client = app.test_client()
+
+    def request(self, method, path, payload):
+        return self.client.open(path, method=method, json=payload).status_code
+
+def run_scenario(make_client, scenario, concurrency, duration, n_days, seed):
+    # Every worker loops until the deadline; returns {endpoint: [(seconds, status)]}
+    mix = MIXES.get(scenario, {scenario: 1})
+    names, weights = list(mix), list(mix.values())
+    samples = defaultdict(list)
+    lock = threading.Lock()
+    start = threading.Barrier(concurrency + 1)
+
+    def worker(index):
+        rng = random.Random(seed + index)
+        client = make_client()
+        local = defaultdict(list)
+        start.wait()
+        deadline = time.perf_counter() + duration
+        while time.perf_counter() < deadline:
+            name = rng.choices(names, weights)[0]
+            method, path, payload = ENDPOINTS[name]
+            started = time.perf_counter()
+            try:
+                status = client.request(method, path, payload and payload(rng, n_days))
+            except requests.RequestException:
+                status = 0
+            local[name].append((time.perf_counter() - started, status))
+        with lock:
+            for name, values in local.items():
+                samples[name].extend(values)
+
+    threads = [threading.Thread(target=worker, args=(i,), daemon=True) for i in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    start.wait()
+    began = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    return samples, time.perf_counter() - began
+
+def summarize(samples, elapsed):
+    summary = {}
+    for name, values in sorted(samples.items()):
+        latencies = np.array([seconds for seconds, _ in values]) * 1000
+        statuses = defaultdict(int)
+        for _, status in values:
+            statuses[str(status)] += 1
+        p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+        summary[name] = {
+            'requests': len(values),
+            'errors': sum(count for status, count in statuses.items() if not status.startswith(('2', '3'))),
+            'statuses': dict(statuses),
+            'requests_per_s': len(values) / elapsed,
+            'p50_ms': float(p50),
+            'p95_ms': float(p95),
+            'p99_ms': float(p99),
+        }
+    return summary
+
+def print_summary(scenario, summary):
+    print(f"\n{scenario}")
+    print(f"  {'endpoint':<16} {'requests':>8} {'errors':>7} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for name, row in summary.items():
+        print(f"  {name:<16} {row['requests']:>8} {row['errors']:>7} {row['requests_per_s']:>8.1f} "
+              f"{row['p50_ms']:>8.2f} {row['p95_ms']:>8.2f} {row['p99_ms']:>8.2f}")
+
+def start_server(app):
+    from werkzeug.serving import make_server
+    logging.getLogger('werkzeug').setLevel(logging.WARNING)  # no per-request access log
+    server = make_server('127.0.0.1', 0, app, threaded=True)
+    threading.Thread(target=server.serve_forever, name="loadtest-server", daemon=True).start()
+    return server
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the Flask API")
+    parser.add_argument('--url', help='target a running server instead of a seeded in-process one')
+    parser.add_argument('--test-client', action='store_true', help='call the app in process, without HTTP')
+    parser.add_argument('--transactions', type=int, default=100000, help='ledger size to seed')
+    parser.add_argument('--concurrency', type=int, default=8, help='client threads')
+    parser.add_argument('--duration', type=float, default=10.0, help='seconds per scenario')
+    parser.add_argument('--scenarios', default=','.join(DEFAULT_SCENARIOS),
+                        help=f"comma-separated endpoints and/or mixes (default: all of {', '.join(DEFAULT_SCENARIOS)})")
+    parser.add_argument('--seed', type=int, default=7)
+    parser.add_argument('--json', help='also write the results to this file')
+    args = parser.parse_args()
+    scenarios = args.scenarios.split(',')
+    unknown = set(scenarios) - set(DEFAULT_SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+
+    report = {
+        **report_header('loadtest'),
+        'concurrency': args.concurrency,
+        'duration_s': args.duration,
+        'scenarios': {}
+    }
+    server = workdir = None
+    n_days = ledger_span(args.transactions)
+    try:
+        if args.url:
+            make_client = lambda: HttpClient(args.url)
+            report['target'] = args.url
+        else:
+            backend, workdir = load_backend()
+            with backend.app.app_context():
+                seed_ledger(backend, args.transactions, args.seed)
+                for category in EXPENSE_CATEGORIES:
+                    backend.db.session.add(backend.Budget(category=category, limit=500.0))
+                backend.bump_data_version(backend.DEFAULT_USER_ID, "budgets")
+                backend.db.session.commit()
+            report['transactions'] = args.transactions
+            if args.test_client:
+                make_client = lambda: TestClient(backend.app)
+                report['target'] = 'test-client'
+            else:
+                server = start_server(backend.app)
+                make_client = lambda: HttpClient(f"http://127.0.0.1:{server.server_port}")
+                report['target'] = 'werkzeug-threaded'
+
+        # Train once up front so /forecast measures serving, not the first fit
+        make_client().request('GET', '/forecast?wait=60', None)
+
+        for scenario in scenarios:
+            samples, elapsed = run_scenario(make_client, scenario, args.concurrency, args.duration, n_days, args.seed)
+            summary = summarize(samples, elapsed)
+            report['scenarios'][scenario] = summary
+            print_summary(scenario, summary)
+    finally:
+        if server is not None:
+            server.shutdown()
+        if workdir is not None:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,124 @@
+# --- benchmarks/pipeline.py (forecast and advisor pipeline timings) ---
+# Seeds synthetic ledgers of increasing size into a throwaway SQLite database,
+# times each stage of the /forecast and /advisor pipelines, and backtests both
+# forecast engines on the seeded expenses. --json writes the results in a
+# stable shape so runs can be compared across commits.
+#
+#   python benchmarks/pipeline.py [--sizes 1000,100000,1000000] [--repeat 3] [--json out.json]
+
+import argparse
+import json
+import shutil
+import sys
+import time
+from datetime import timedelta
+
+import numpy as np
+import pandas as pd
+
+from synthetic import load_backend, report_header, seed_ledger
+from forecast_accuracy import backtest_series
+
+def timed(stages, name, fn, *args):
+    started = time.perf_counter()
+    result = fn(*args)
+    stages.setdefault(name, []).append(time.perf_counter() - started)
+    return result
+
+def run_stages(backend, forecasting, client, stages):
+    db = backend.db
+    user_id = backend.DEFAULT_USER_ID
+    # New data version, so every memoized result below is recomputed
+    backend.bump_data_version(user_id)
+    db.session.commit()
+
+    # engine=rf, the work the background trainer does per retrain
+    rows = timed(stages, 'forecast.query', backend.daily_expense_aggregates, user_id)
+    daily = timed(stages, 'forecast.dataframe', pd.DataFrame.from_records, rows,
+                  None, None, ['date', 'total_amount', 'transaction_count', 'common_category'])
+    daily = timed(stages, 'forecast.features', forecasting.add_daily_features, daily)
+    bundle = timed(stages, 'forecast.fit', forecasting.train_forecast_models, daily)
+    timed(stages, 'forecast.predict', forecasting.predict_forecast, bundle)
+
+    # engine=fast
+    totals = timed(stages, 'forecast_fast.query', backend.daily_expense_totals, user_id)
+    model = timed(stages, 'forecast_fast.fit', forecasting.fit_fast,
+                  [d for d, _, _ in totals], [total for _, total, _ in totals])
+    timed(stages, 'forecast_fast.predict', forecasting.predict_fast, model)
+
+    # Advisor statistics on a fresh engine so nothing is memoized
+    stats = timed(stages, 'advisor.query', backend.AdvisorEngine().stats,
+                  user_id, backend.get_data_version(user_id), backend.ADVISOR_WINDOW_DAYS)
+    timed(stages, 'advisor.advice', backend.build_advice, stats)
+
+    # End to end through the routes: first call computes, second is memoized
+    for path in ('/advisor', '/forecast?engine=fast'):
+        for phase in ('cold', 'warm'):
+            response = timed(stages, f'http {path} {phase}', client.get, path)
+            assert response.status_code == 200, (path, response.status_code)
+
+def daily_series(totals):
+    # Consecutive days from the first to the last expense, zeros filled in
+    by_day = {d: total for d, total, _ in totals}
+    first, last = min(by_day), max(by_day)
+    dates = [first + timedelta(days=i) for i in range((last - first).days + 1)]
+    return dates, np.array([by_day.get(d, 0.0) for d in dates])
+
+def main():
+    parser = argparse.ArgumentParser(description="Time the forecast and advisor pipelines on synthetic ledgers")
+    parser.add_argument('--sizes', default='1000,100000,1000000', help='comma-separated ledger sizes')
+    parser.add_argument('--repeat', type=int, default=3, help='runs per stage; the median is reported')
+    parser.add_argument('--origins', type=int, default=8, help='rolling origins per backtest')
+    parser.add_argument('--other-users', type=int, default=0,
+                        help="transactions seeded under another user first; timings should not move")
+    parser.add_argument('--seed', type=int, default=7)
+    parser.add_argument('--json', help='also write the results to this file')
+    args = parser.parse_args()
+    sizes = [int(size) for size in args.sizes.split(',')]
+
+    backend, workdir = load_backend()
+    import forecasting
+    report = {
+        **report_header('pipeline'),
+        'repeat': args.repeat,
+        'other_users_transactions': args.other_users,
+        'results': []
+    }
+    try:
+        with backend.app.app_context():
+            client = backend.app.test_client()
+            if args.other_users:
+                seed_ledger(backend, args.other_users, args.seed + 1, user_id='benchmark-neighbour')
+            for size in sizes:
+                insert_s, rollup_s = seed_ledger(backend, size, args.seed)
+                stages = {}
+                for _ in range(args.repeat):
+                    run_stages(backend, forecasting, client, stages)
+                dates, totals = daily_series(backend.daily_expense_totals(backend.DEFAULT_USER_ID))
+                result = {
+                    'transactions': size,
+                    'days': len(dates),
+                    'seed_ms': {'insert': insert_s * 1000, 'rollup_rebuild': rollup_s * 1000},
+                    'stages_ms': {name: float(np.median(times) * 1000) for name, times in stages.items()},
+                    'backtest': backtest_series(dates, totals, args.origins)
+                }
+                report['results'].append(result)
+                print_result(result)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+
+def print_result(result):
+    print(f"\n{result['transactions']:,} transactions over {result['days']} days "
+          f"(insert {result['seed_ms']['insert']:.0f} ms, rollup rebuild {result['seed_ms']['rollup_rebuild']:.0f} ms)")
+    for name, ms in result['stages_ms'].items():
+        print(f"  {name:<32} {ms:>10.2f} ms")
+    for engine, scores in result['backtest'].items():
+        print(f"  backtest {engine:<23} MAE {scores['mae']:>8.2f}  fit {scores['fit_ms']:.2f} ms")
+    sys.stdout.flush()
+
+if __name__ == '__main__':
+    main()
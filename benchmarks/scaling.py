@@ -0,0 +1,113 @@
+# --- benchmarks/scaling.py (throughput against serve.py worker count) ---
+# Seeds a synthetic ledger into a throwaway SQLite database, then for each
+# worker count starts serve.py on it and drives it with loadtest.py. Reports
+# total throughput per scenario and the p99 latency of the short I/O-bound
+# endpoints, which should stay flat while batch forecasts run in the
+# analytics pool. The ledger is reseeded before every run.
+#
+#   python benchmarks/scaling.py [--workers 1,2,4] [--threads 4] [--scenarios mixed,analytics] [--json out.json]
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import requests
+
+from synthetic import BENCHMARK_DIR, free_port, load_backend, report_header, seed_ledger
+
+REPO_DIR = os.path.dirname(BENCHMARK_DIR)
+IO_ENDPOINTS = ('transactions', 'summary', 'budget')
+SERVER_START_TIMEOUT = 120
+
+def start_server(workers, args, env):
+    port = free_port()
+    server = subprocess.Popen([
+        sys.executable, os.path.join(REPO_DIR, 'serve.py'),
+        '--bind', f'127.0.0.1:{port}',
+        '--workers', str(workers),
+        '--threads', str(args.threads),
+        '--analytics-processes', str(args.analytics_processes)
+    ], env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    url = f'http://127.0.0.1:{port}'
+    deadline = time.monotonic() + SERVER_START_TIMEOUT
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"serve.py exited with status {server.returncode}")
+        try:
+            if requests.get(url + '/', timeout=5).status_code == 200:
+                return server, url
+        except requests.ConnectionError:
+            time.sleep(0.1)
+    server.terminate()
+    raise RuntimeError("serve.py did not start in time")
+
+def run_loadtest(url, args, workdir):
+    output = os.path.join(workdir, 'loadtest.json')
+    subprocess.run([
+        sys.executable, os.path.join(BENCHMARK_DIR, 'loadtest.py'),
+        '--url', url,
+        '--concurrency', str(args.concurrency),
+        '--duration', str(args.duration),
+        '--scenarios', args.scenarios,
+        '--json', output
+    ], check=True, stdout=subprocess.DEVNULL)
+    with open(output) as f:
+        return json.load(f)['scenarios']
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure API throughput against the number of serve.py workers")
+    parser.add_argument('--workers', default='1,2,4', help='comma-separated worker counts')
+    parser.add_argument('--threads', type=int, default=4, help='request threads per worker')
+    parser.add_argument('--analytics-processes', type=int, default=1, help='analytics pool size per worker')
+    parser.add_argument('--transactions', type=int, default=100000, help='ledger size to seed')
+    parser.add_argument('--concurrency', type=int, default=16, help='client threads')
+    parser.add_argument('--duration', type=float, default=10.0, help='seconds per scenario')
+    parser.add_argument('--scenarios', default='mixed,analytics')
+    parser.add_argument('--json', help='also write the results to this file')
+    args = parser.parse_args()
+
+    backend, workdir = load_backend()
+    env = dict(os.environ, FORECAST_RETRAIN_DELAY='2')
+    report = {
+        **report_header('scaling'),
+        'cpu_count': os.cpu_count(),
+        'threads': args.threads,
+        'analytics_processes': args.analytics_processes,
+        'transactions': args.transactions,
+        'runs': {}
+    }
+    print(f"{os.cpu_count()} CPUs, {args.threads} threads and {args.analytics_processes} analytics processes per worker")
+    print(f"  {'workers':>7}  {'scenario':<12}{'req/s':>10}{'io p99 ms':>12}{'errors':>8}")
+    try:
+        for workers in map(int, args.workers.split(',')):
+            with backend.app.app_context():
+                seed_ledger(backend, args.transactions)
+                backend.db.engine.dispose()
+            shutil.rmtree(os.environ['FORECAST_MODEL_DIR'], ignore_errors=True)
+            server, url = start_server(workers, args, env)
+            try:
+                with tempfile.TemporaryDirectory() as rundir:
+                    scenarios = run_loadtest(url, args, rundir)
+            finally:
+                server.terminate()
+                server.wait()
+            report['runs'][workers] = scenarios
+            for scenario, summary in scenarios.items():
+                elapsed = max(row['requests'] / row['requests_per_s'] for row in summary.values())
+                throughput = sum(row['requests'] for row in summary.values()) / elapsed
+                io_p99 = max((row['p99_ms'] for name, row in summary.items() if name in IO_ENDPOINTS), default=0.0)
+                errors = sum(row['errors'] for row in summary.values())
+                print(f"  {workers:>7}  {scenario:<12}{throughput:>10.1f}{io_p99:>12.1f}{errors:>8}")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+# --- benchmarks/sqlite_concurrency.py (SQLite profile before/after) ---
+# Runs the write-heavy load-test scenarios once per SQLITE_PROFILE, each in a
+# fresh process and database, and prints throughput, tail latency and error
+# counts side by side.
+#
+#   python benchmarks/sqlite_concurrency.py [--concurrency 16] [--duration 10] [--json out.json]
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+PROFILES = ('default', 'tuned')
+
+def run_loadtest(profile, args):
+    with tempfile.TemporaryDirectory(prefix='finance-sqlite-') as workdir:
+        output = os.path.join(workdir, 'loadtest.json')
+        env = dict(os.environ, SQLITE_PROFILE=profile)
+        env.pop('DATABASE_URL', None)
+        subprocess.run([
+            sys.executable, os.path.join(BENCHMARK_DIR, 'loadtest.py'),
+            '--transactions', str(args.transactions),
+            '--concurrency', str(args.concurrency),
+            '--duration', str(args.duration),
+            '--scenarios', args.scenarios,
+            '--json', output
+        ], env=env, check=True, stdout=subprocess.DEVNULL)
+        with open(output) as f:
+            return json.load(f)
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare SQLite profiles under concurrent reads and writes")
+    parser.add_argument('--transactions', type=int, default=100000, help='ledger size to seed')
+    parser.add_argument('--concurrency', type=int, default=16, help='client threads')
+    parser.add_argument('--duration', type=float, default=10.0, help='seconds per scenario')
+    parser.add_argument('--scenarios', default='add,contention,mixed')
+    parser.add_argument('--json', help='also write the results to this file')
+    args = parser.parse_args()
+
+    results = {profile: run_loadtest(profile, args) for profile in PROFILES}
+
+    columns = ''.join(f"{profile + ' ' + field:>17}" for field in ('req/s', 'p99 ms', 'errors') for profile in PROFILES)
+    for scenario in args.scenarios.split(','):
+        print(f"\n{scenario}\n  {'endpoint':<16}{columns}")
+        for endpoint in results[PROFILES[0]]['scenarios'][scenario]:
+            rows = [results[profile]['scenarios'][scenario].get(endpoint, {}) for profile in PROFILES]
+            cells = [f"{row.get('requests_per_s', 0):>17.1f}" for row in rows]
+            cells += [f"{row.get('p99_ms', 0):>17.1f}" for row in rows]
+            cells += [f"{row.get('errors', 0):>17}" for row in rows]
+            print(f"  {endpoint:<16}{''.join(cells)}")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'benchmark': 'sqlite_concurrency', 'profiles': results}, f, indent=2)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,130 @@
+# --- benchmarks/startup.py (cold start of the Flask backend) ---
+# Starts the API in a fresh process against an empty SQLite database and
+# measures how long it takes until the first /add is served, then how long
+# the first bulk import, forecast and advisor request take once it is up
+# (those pay for loading pandas, NumPy and scikit-learn on first use).
+#
+#   lazy     app.py as shipped
+#   preload  PRELOAD_ANALYTICS=1: analytics load on a background thread
+#   eager    the analytics stack imported before app.py, as it used to be
+#
+#   python benchmarks/startup.py [--repeat 5] [--modes lazy,preload,eager] [--json out.json]
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+import requests
+
+from synthetic import free_port, report_header
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCHMARK_DIR)
+MODES = ('lazy', 'preload', 'eager')
+FIRST_REQUEST_TIMEOUT = 60
+
+SERVER_SCRIPT = """
+import sys
+sys.path.insert(0, {repo!r})
+if {eager!r}:
+    import forecasting
+    forecasting.preload()
+import app
+from werkzeug.serving import run_simple
+run_simple('127.0.0.1', {port}, app.app, threaded=True)
+"""
+
+def bulk_payload():
+    # Three weeks of daily expenses, enough for forecasts and advice
+    first = date(2024, 1, 1)
+    return [{
+        "type": "Expense",
+        "category": ("Food", "Transport", "Rent")[i % 3],
+        "amount": 20.0 + i % 7 * 5,
+        "description": "",
+        "date": (first + timedelta(days=i)).isoformat()
+    } for i in range(21)]
+
+def timed_request(session, method, url, **kwargs):
+    started = time.perf_counter()
+    response = session.request(method, url, timeout=FIRST_REQUEST_TIMEOUT, **kwargs)
+    response.raise_for_status()
+    return time.perf_counter() - started
+
+def run_once(mode):
+    workdir = tempfile.mkdtemp(prefix='finance-startup-')
+    port = free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    env = dict(
+        os.environ,
+        DATABASE_URL='sqlite:///' + os.path.join(workdir, 'startup.db'),
+        FORECAST_MODEL_DIR=os.path.join(workdir, 'forecast_models'),
+        FORECAST_RETRAIN_DELAY='60',  # keep the background trainer out of the timings
+        PRELOAD_ANALYTICS='1' if mode == 'preload' else '0'
+    )
+    script = SERVER_SCRIPT.format(repo=REPO_DIR, eager=mode == 'eager', port=port)
+    session = requests.Session()
+    transaction = {"type": "Expense", "category": "Food", "amount": 12.5, "description": "", "date": "2024-01-01"}
+    started = time.perf_counter()
+    server = subprocess.Popen([sys.executable, '-c', script], env=env,
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        # Poll until the first write succeeds: import, migrations and socket bind
+        while True:
+            if server.poll() is not None:
+                raise RuntimeError(f"server exited with status {server.returncode}")
+            if time.perf_counter() - started > FIRST_REQUEST_TIMEOUT:
+                raise RuntimeError("server did not answer /add in time")
+            try:
+                if session.post(f"{base_url}/add", json=transaction, timeout=FIRST_REQUEST_TIMEOUT).status_code == 201:
+                    break
+            except requests.ConnectionError:
+                time.sleep(0.005)
+        result = {'first_add_s': time.perf_counter() - started}
+        result['next_add_s'] = timed_request(session, 'POST', f"{base_url}/add", json=transaction)
+        result['first_bulk_s'] = timed_request(session, 'POST', f"{base_url}/transactions/bulk", json=bulk_payload())
+        result['first_forecast_fast_s'] = timed_request(session, 'GET', f"{base_url}/forecast?engine=fast")
+        result['first_advisor_s'] = timed_request(session, 'GET', f"{base_url}/advisor")
+        return result
+    finally:
+        server.terminate()
+        server.wait()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure backend cold start")
+    parser.add_argument('--repeat', type=int, default=5, help='fresh processes per mode; medians are reported')
+    parser.add_argument('--modes', default=','.join(MODES), help=f"comma-separated, any of {', '.join(MODES)}")
+    parser.add_argument('--json', help='also write the results to this file')
+    args = parser.parse_args()
+    modes = args.modes.split(',')
+    unknown = set(modes) - set(MODES)
+    if unknown:
+        parser.error(f"unknown modes: {', '.join(sorted(unknown))}")
+
+    report = {
+        **report_header('startup'),
+        'repeat': args.repeat,
+        'modes': {}
+    }
+    print(f"  {'mode':<10}{'first /add':>12}{'next /add':>12}{'first bulk':>12}{'first fcst':>12}{'first advice':>14}   (ms, median)")
+    for mode in modes:
+        runs = [run_once(mode) for _ in range(args.repeat)]
+        medians = {key: statistics.median(run[key] for run in runs) for key in runs[0]}
+        report['modes'][mode] = {'median': medians, 'runs': runs}
+        print(f"  {mode:<10}" + ''.join(f"{medians[key] * 1000:>12.1f}" for key in list(medians)[:4])
+              + f"{medians['first_advisor_s'] * 1000:>14.1f}")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+
+if __name__ == '__main__':
+    main()
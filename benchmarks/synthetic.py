@@ -0,0 +1,91 @@
+# --- benchmarks/synthetic.py (synthetic ledgers and helpers shared by the benchmark scripts) ---
+
+import os
+import platform
+import socket
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta, timezone
+
+import numpy as np
+from sqlalchemy import insert
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCHMARK_DIR, '..'))
+
+EXPENSE_CATEGORIES = ["Food", "Transport", "Entertainment", "Utilities", "Healthcare", "Shopping", "Rent"]
+INCOME_SHARE = 0.05
+FIRST_DAY = date(2023, 1, 2)
+
+def report_header(benchmark):
+    # Fields every --json report starts with
+    return {
+        'benchmark': benchmark,
+        'generated_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform()
+    }
+
+def free_port():
+    # An unused local port for a server under test
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+def load_backend(workdir=None):
+    # Imports app.py against a throwaway SQLite database and model path; app
+    # reads both at import time, so call this before anything imports app
+    workdir = workdir or tempfile.mkdtemp(prefix='finance-bench-')
+    os.environ.setdefault('DATABASE_URL', 'sqlite:///' + os.path.join(workdir, 'bench.db'))
+    os.environ.setdefault('FORECAST_MODEL_DIR', os.path.join(workdir, 'forecast_models'))
+    import app
+    return app, workdir
+
+def ledger_span(n_transactions):
+    # Roughly ten transactions a day, between 60 days and three years
+    return min(max(n_transactions // 10, 60), 3 * 365)
+
+def ledger_chunks(n_transactions, user_id, seed=0, chunk_size=50000):
+    # Yields lists of Transaction row dicts. Expenses are gamma-distributed
+    # with a weekend lift; about one row in twenty is a salary payment.
+    rng = np.random.default_rng(seed)
+    n_days = ledger_span(n_transactions)
+    days = [FIRST_DAY + timedelta(days=i) for i in range(n_days)]
+    weekend_lift = np.array([1.4 if d.weekday() >= 5 else 1.0 for d in days])
+    for start in range(0, n_transactions, chunk_size):
+        size = min(chunk_size, n_transactions - start)
+        offsets = rng.integers(0, n_days, size)
+        is_income = rng.random(size) < INCOME_SHARE
+        amounts = np.where(
+            is_income,
+            rng.normal(2500, 400, size),
+            rng.gamma(2.0, 20.0, size) * weekend_lift[offsets]
+        ).round(2)
+        categories = rng.choice(EXPENSE_CATEGORIES, size)
+        yield [{
+            'user_id': user_id,
+            'type': "Income" if income else "Expense",
+            'category': "Salary" if income else str(category),
+            'amount': float(abs(amount)),
+            'description': "",
+            'date': days[offset]
+        } for offset, income, amount, category in zip(offsets, is_income, amounts, categories)]
+
+def seed_ledger(backend, n_transactions, seed=0, user_id=None):
+    # Replaces the user's ledger (the default user's unless given) with
+    # n_transactions synthetic rows and rebuilds the rollups. Must run inside
+    # an app context. Returns seconds spent on the inserts and on the rollup
+    # rebuild.
+    db = backend.db
+    user_id = user_id or backend.DEFAULT_USER_ID
+    started = time.perf_counter()
+    db.session.execute(db.delete(backend.Transaction).where(backend.Transaction.user_id == user_id))
+    for rows in ledger_chunks(n_transactions, user_id, seed):
+        db.session.execute(insert(backend.Transaction), rows)
+    db.session.commit()
+    inserted = time.perf_counter()
+    backend.rebuild_rollups()
+    backend.bump_data_version(user_id)
+    db.session.commit()
+    return inserted - started, time.perf_counter() - inserted
@@ -0,0 +1,98 @@
+# --- benchmarks/wire_formats.py (/transactions response formats) ---
+# Seeds a synthetic ledger and fetches the same rows from /transactions in
+# each format the endpoint negotiates through Accept, reporting payload size,
+# server time and the client's time to turn the body into a DataFrame.
+# Row-object JSON pages are capped at TRANSACTIONS_MAX_PAGE_SIZE, so larger
+# reads in that format are timed as a walk over consecutive pages.
+#
+#   python benchmarks/wire_formats.py [--transactions 100000] [--rows 1000,10000,50000] [--json out.json]
+
+import argparse
+import json
+import shutil
+import time
+
+import pandas as pd
+import pyarrow as pa
+
+from synthetic import load_backend, report_header, seed_ledger
+
+# Each decoder turns a response into (DataFrame, next page cursor)
+
+def decode_rows(response):
+    body = json.loads(response.get_data())
+    return pd.DataFrame(body['transactions']), body['next_cursor']
+
+def decode_columns(response):
+    body = json.loads(response.get_data())
+    return pd.DataFrame(body['columns']), body['next_cursor']
+
+def decode_arrow(response):
+    return pa.ipc.open_stream(response.get_data()).read_pandas(), response.headers.get('X-Next-Cursor')
+
+def fetch(client, mimetype, decode, n_rows, page_size):
+    # Returns (bytes, server seconds, decode seconds, rows) for n_rows rows
+    total_bytes = server_s = decode_s = rows = 0
+    cursor = None
+    while rows < n_rows:
+        path = f"/transactions?limit={min(page_size, n_rows - rows)}" + (f"&cursor={cursor}" if cursor else "")
+        started = time.perf_counter()
+        response = client.get(path, headers={"Accept": mimetype})
+        server_s += time.perf_counter() - started
+        started = time.perf_counter()
+        frame, cursor = decode(response)
+        decode_s += time.perf_counter() - started
+        total_bytes += len(response.get_data())
+        rows += len(frame)
+        if not cursor:
+            break
+    return total_bytes, server_s, decode_s, rows
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare /transactions wire formats")
+    parser.add_argument('--transactions', type=int, default=100000, help='ledger size to seed')
+    parser.add_argument('--rows', default='1000,10000,50000', help='comma-separated rows per read')
+    parser.add_argument('--repeat', type=int, default=3, help='reads per format; the fastest is reported')
+    parser.add_argument('--json', help='also write the results to this file')
+    args = parser.parse_args()
+
+    backend, workdir = load_backend()
+    formats = {
+        'json rows': (backend.JSON_MIMETYPE, decode_rows, backend.TRANSACTIONS_MAX_PAGE_SIZE),
+        'json columns': (backend.COLUMNS_MIMETYPE, decode_columns, backend.TRANSACTIONS_MAX_COLUMNAR_PAGE_SIZE),
+        'arrow': (backend.ARROW_MIMETYPE, decode_arrow, backend.TRANSACTIONS_MAX_COLUMNAR_PAGE_SIZE),
+    }
+    report = {
+        **report_header('wire_formats'),
+        'transactions': args.transactions,
+        'reads': {}
+    }
+    try:
+        with backend.app.app_context():
+            seed_ledger(backend, args.transactions)
+        client = backend.app.test_client()
+        for n_rows in map(int, args.rows.split(',')):
+            print(f"\n{n_rows} rows\n  {'format':<14}{'bytes':>12}{'server ms':>12}{'decode ms':>12}{'size vs rows':>14}")
+            results = report['reads'][n_rows] = {}
+            for name, (mimetype, decode, page_size) in formats.items():
+                runs = [fetch(client, mimetype, decode, n_rows, page_size) for _ in range(args.repeat)]
+                size, _, _, rows = runs[0]
+                results[name] = {
+                    'bytes': size,
+                    'rows': rows,
+                    'server_ms': min(run[1] for run in runs) * 1000,
+                    'decode_ms': min(run[2] for run in runs) * 1000
+                }
+            baseline = results['json rows']['bytes']
+            for name, row in results.items():
+                print(f"  {name:<14}{row['bytes']:>12}{row['server_ms']:>12.1f}{row['decode_ms']:>12.1f}"
+                      f"{row['bytes'] / baseline:>13.2f}x")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+
+if __name__ == '__main__':
+    main()
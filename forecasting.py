@@ -0,0 +1,239 @@
+# --- forecasting.py (forecast models, independent of Flask and the database) ---
+
+import numpy as np
+from datetime import timedelta
+
+FORECAST_FEATURES = ['day', 'day_of_week', 'is_weekend', 'rolling_avg']
+
+# --- RandomForest + polynomial blend (engine "rf") ---
+# pandas and scikit-learn are imported inside these functions: they take
+# seconds to load and the other engines only need NumPy.
+
+def preload():
+    # Import everything the rf engine needs ahead of its first use
+    import pandas
+    import sklearn.ensemble
+    import sklearn.linear_model
+    import sklearn.pipeline
+    import sklearn.preprocessing
+
+def add_daily_features(daily):
+    # daily: one row per day with 'date' and 'total_amount'
+    import pandas as pd
+    daily['date'] = pd.to_datetime(daily['date'])
+    daily['total_amount'] = daily['total_amount'].astype(float)
+    daily['day_of_week'] = daily['date'].dt.dayofweek
+    daily['is_weekend'] = daily['day_of_week'].isin([5, 6]).astype(int)
+    
+    # Create time-based features
+    daily['day'] = (daily['date'] - daily['date'].min()).dt.days
+    daily['rolling_avg'] = daily['total_amount'].rolling(window=7, min_periods=1).mean()
+    daily['rolling_std'] = daily['total_amount'].rolling(window=7, min_periods=1).std()
+    return daily
+
+def train_forecast_models(daily):
+    from sklearn.ensemble import RandomForestRegressor
+    from sklearn.linear_model import LinearRegression
+    from sklearn.pipeline import make_pipeline
+    from sklearn.preprocessing import PolynomialFeatures
+
+    # Train multiple models
+    X = daily[FORECAST_FEATURES]
+    y = daily['total_amount']
+    
+    # Model 1: Random Forest
+    rf_model = RandomForestRegressor(n_estimators=100, random_state=42)
+    rf_model.fit(X, y)
+    
+    # Model 2: Polynomial Regression
+    poly_model = make_pipeline(
+        PolynomialFeatures(degree=2),
+        LinearRegression()
+    )
+    poly_model.fit(X[['day']], y)
+
+    # Everything predict_forecast needs, so a cached bundle never touches the ledger
+    return {
+        'rf_model': rf_model,
+        'poly_model': poly_model,
+        'first_date': daily['date'].min(),
+        'last_date': daily['date'].max(),
+        'recent_avg': daily['total_amount'].iloc[-7:].mean(),
+        'avg_std': daily['rolling_std'].mean()
+    }
+
+def predict_forecast(bundle, horizon=7):
+    import pandas as pd
+
+    # Generate forecast dates
+    last_date = bundle['last_date']
+    future_days = [(last_date + timedelta(days=i)) for i in range(1, horizon + 1)]
+    
+    # Prepare features for future predictions
+    future_df = pd.DataFrame({
+        'date': future_days,
+        'day': [(d - bundle['first_date']).days for d in future_days],
+        'day_of_week': [d.weekday() for d in future_days],
+        'is_weekend': [int(d.weekday() in [5, 6]) for d in future_days],
+        'rolling_avg': [bundle['recent_avg']] * horizon
+    })
+    
+    # Make predictions
+    rf_pred = bundle['rf_model'].predict(future_df[FORECAST_FEATURES])
+    poly_pred = bundle['poly_model'].predict(future_df[['day']])
+    
+    # Combine predictions (weighted average)
+    final_pred = (rf_pred * 0.7 + poly_pred * 0.3)
+    
+    # Calculate confidence intervals using rolling standard deviation
+    return forecast_rows(future_days, final_pred, bundle['avg_std'])
+
+def fit_and_predict(daily):
+    # One call, so a worker process sends the fitted models back only once.
+    # Predictions only depend on the bundle, so they are kept alongside it.
+    bundle = train_forecast_models(daily)
+    bundle['forecast'] = predict_forecast(bundle)
+    return bundle
+
+def forecast_rows(dates, predictions, spread):
+    return [{
+        'date': d.strftime('%Y-%m-%d'),
+        'predicted_amount': float(p),
+        'confidence_low': float(max(0, p - spread)),
+        'confidence_high': float(p + spread),
+        'day_of_week': d.strftime('%A')
+    } for d, p in zip(dates, predictions)]
+
+# --- Closed-form engine (engine "fast") ---
+# Additive weekday seasonality, an EWMA level and a damped least-squares
+# trend. Fitting is a handful of O(n) NumPy reductions and the fitted model
+# is ten numbers, whatever the history length.
+
+EWMA_ALPHA = 0.3
+TREND_WINDOW = 28
+TREND_DAMPING = 0.9
+
+def fit_fast(dates, totals):
+    # dates/totals: per-day expense totals, any order; days missing from the
+    # input count as zero spend
+    days = np.asarray(dates, dtype='datetime64[D]')
+    first = days.min()
+    index = (days - first).astype(int)
+    y = np.bincount(index, weights=np.asarray(totals, dtype=float))
+    n = len(y)
+    weekday = (first.astype(object).weekday() + np.arange(n)) % 7
+
+    # Weekday effect relative to the overall mean
+    counts = np.bincount(weekday, minlength=7)
+    seasonal = np.bincount(weekday, weights=y, minlength=7) / np.maximum(counts, 1) - y.mean()
+    seasonal[counts == 0] = 0.0
+    deseasoned = y - seasonal[weekday]
+
+    # EWMA level in closed form: one dot product with geometric weights
+    weights = EWMA_ALPHA * (1 - EWMA_ALPHA) ** np.arange(n)
+    weights[-1] = (1 - EWMA_ALPHA) ** (n - 1)
+    level = float(np.dot(weights, deseasoned[::-1]))
+
+    # Least-squares slope over the most recent window
+    recent = deseasoned[-TREND_WINDOW:]
+    t = np.arange(len(recent)) - (len(recent) - 1) / 2
+    slope = float(np.dot(t, recent - recent.mean()) / np.dot(t, t)) if len(recent) > 1 else 0.0
+    residual_std = float(np.std(recent - recent.mean() - slope * t))
+
+    return {
+        'last_date': (first + np.timedelta64(n - 1, 'D')).astype(object),
+        'level': level,
+        'slope': slope,
+        'seasonal': seasonal,
+        'residual_std': residual_std
+    }
+
+def predict_fast(model, horizon=7):
+    steps = np.arange(1, horizon + 1)
+    damped_steps = np.cumsum(TREND_DAMPING ** steps)
+    future_days = [model['last_date'] + timedelta(days=int(h)) for h in steps]
+    weekday = np.array([d.weekday() for d in future_days])
+    predictions = np.maximum(model['level'] + model['slope'] * damped_steps + model['seasonal'][weekday], 0.0)
+    return forecast_rows(future_days, predictions, model['residual_std'])
+
+# --- Vectorized batch forecasting (GET /forecast/batch) ---
+
+ROLLING_WINDOW = 7
+RIDGE_PENALTY = 1e-3
+MIN_OBSERVED_DAYS = 14
+
+def dense_matrix(series_index, day_index, amounts, n_series, n_days):
+    # Scatter (series, day, amount) triples into an S x T matrix; days without
+    # spending stay at zero
+    matrix = np.zeros((n_series, n_days))
+    np.add.at(matrix, (series_index, day_index), amounts)
+    return matrix
+
+def lagged_rolling_mean(Y, window=ROLLING_WINDOW):
+    # Mean of the previous `window` days for every series and day at once
+    # (cumulative-sum trick, min_periods=1; day 0 has no history and gets 0)
+    cumulative = np.zeros((Y.shape[0], Y.shape[1] + 1))
+    np.cumsum(Y, axis=1, out=cumulative[:, 1:])
+    t = np.arange(Y.shape[1])
+    lower = np.maximum(t - window, 0)
+    counts = np.maximum(t - lower, 1)
+    return (cumulative[:, t] - cumulative[:, lower]) / counts
+
+def design_matrix(day_numbers, weekdays, rolling, n_days):
+    # Stacked S x T x F features: intercept, scaled trend, weekday one-hots
+    # (Monday is the baseline) and the lagged rolling mean
+    n_series, n_steps = rolling.shape
+    X = np.empty((n_series, n_steps, 9))
+    X[:, :, 0] = 1.0
+    X[:, :, 1] = day_numbers / max(n_days, 1)
+    X[:, :, 2:8] = (weekdays[:, None] == np.arange(1, 7)).astype(float)
+    X[:, :, 8] = rolling
+    return X
+
+def fit_batch(X, Y, weights):
+    # Weighted ridge least squares for every series in one batched solve
+    Xw_t = (X * weights[:, :, None]).transpose(0, 2, 1)
+    XtX = Xw_t @ X
+    Xty = Xw_t @ Y[:, :, None]
+    penalty = RIDGE_PENALTY * np.eye(X.shape[2])
+    penalty[0, 0] = 0.0
+    coefs = np.linalg.solve(XtX + penalty, Xty)[:, :, 0]
+
+    residuals = (Y - (X @ coefs[:, :, None])[:, :, 0]) * weights
+    dof = np.maximum(weights.sum(axis=1) - X.shape[2], 1)
+    residual_std = np.sqrt((residuals ** 2).sum(axis=1) / dof)
+    return coefs, residual_std
+
+def forecast_matrix(Y, first_date, horizon=7):
+    # Fits all rows of the S x T daily matrix Y (day 0 = first_date) together
+    # and predicts `horizon` days past the end. Leading days before a series'
+    # first spend are excluded from its fit. Returns predictions (S x H),
+    # residual standard deviations (S,) and the forecast dates.
+    n_series, n_days = Y.shape
+    days = np.arange(n_days)
+    weekdays = (first_date.weekday() + days) % 7
+    observed = Y != 0
+    first_seen = np.where(observed.any(axis=1), observed.argmax(axis=1), n_days)
+    weights = (days[None, :] >= first_seen[:, None]).astype(float)
+
+    X = design_matrix(days, weekdays, lagged_rolling_mean(Y), n_days)
+    coefs, residual_std = fit_batch(X, Y, weights)
+
+    # Roll forward one day at a time so the rolling feature sees predictions
+    history = Y[:, -ROLLING_WINDOW:]
+    predictions = np.empty((n_series, horizon))
+    for h in range(horizon):
+        day = n_days + h
+        x = design_matrix(
+            np.array([day]), np.array([(first_date.weekday() + day) % 7]),
+            history.mean(axis=1, keepdims=True), n_days
+        )[:, 0, :]
+        predictions[:, h] = np.maximum((x * coefs).sum(axis=1), 0.0)
+        history = np.concatenate([history[:, 1:], predictions[:, h:h + 1]], axis=1)
+
+    dates = [first_date + timedelta(days=n_days + h) for h in range(horizon)]
+    return predictions, residual_std, dates
+
+def observed_days(Y):
+    # Days with any spend per series, used to skip series too short to fit
+    return (Y != 0).sum(axis=1)
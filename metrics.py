@@ -0,0 +1,121 @@
+# --- metrics.py (in-process metrics rendered in Prometheus text format) ---
+
+import threading
+import time
+from contextlib import contextmanager
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100)
+
+def format_labels(names, values):
+    if not names:
+        return ''
+    pairs = ','.join(
+        '{}="{}"'.format(name, str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+        for name, value in zip(names, values)
+    )
+    return '{' + pairs + '}'
+
+def format_value(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class Counter:
+    kind = 'counter'
+
+    def __init__(self, name, help, labels=()):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values, amount=1):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def samples(self):
+        with self._lock:
+            values = sorted(self._values.items())
+        for label_values, value in values:
+            yield self.name, format_labels(self.labels, label_values), value
+
+class Histogram:
+    kind = 'histogram'
+
+    def __init__(self, name, help, labels=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self.buckets = buckets
+        self._values = {}  # label values -> [per-bucket counts..., +Inf count, sum]
+        self._lock = threading.Lock()
+
+    def observe(self, value, *label_values):
+        with self._lock:
+            series = self._values.get(label_values)
+            if series is None:
+                series = self._values[label_values] = [0] * (len(self.buckets) + 1) + [0.0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+            series[-2] += 1
+            series[-1] += value
+
+    def samples(self):
+        with self._lock:
+            values = sorted((labels, list(series)) for labels, series in self._values.items())
+        names = self.labels + ('le',)
+        for label_values, series in values:
+            for bound, count in zip(self.buckets, series):
+                yield f'{self.name}_bucket', format_labels(names, label_values + (format_value(bound),)), count
+            yield f'{self.name}_bucket', format_labels(names, label_values + ('+Inf',)), series[-2]
+            yield f'{self.name}_count', format_labels(self.labels, label_values), series[-2]
+            yield f'{self.name}_sum', format_labels(self.labels, label_values), series[-1]
+
+class Registry:
+    def __init__(self):
+        self._metrics = []
+
+    def counter(self, name, help, labels=()):
+        metric = Counter(name, help, labels)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(self, name, help, labels=(), buckets=LATENCY_BUCKETS):
+        metric = Histogram(name, help, labels, buckets)
+        self._metrics.append(metric)
+        return metric
+
+    def render(self):
+        lines = []
+        for metric in self._metrics:
+            lines.append(f'# HELP {metric.name} {metric.help}')
+            lines.append(f'# TYPE {metric.name} {metric.kind}')
+            for name, labels, value in metric.samples():
+                lines.append(f'{name}{labels} {format_value(value)}')
+        return '\n'.join(lines) + '\n'
+
+registry = Registry()
+
+http_requests = registry.counter(
+    'http_requests_total', 'Requests served, by endpoint, method and status.', ('endpoint', 'method', 'status'))
+http_latency = registry.histogram(
+    'http_request_duration_seconds', 'Request latency in seconds.', ('endpoint', 'method'))
+http_exceptions = registry.counter(
+    'http_exceptions_total', 'Exceptions raised or caught while handling a request.', ('endpoint',))
+db_queries = registry.histogram(
+    'http_request_db_queries', 'Database statements executed per request.', ('endpoint',), COUNT_BUCKETS)
+db_query_time = registry.histogram(
+    'http_request_db_seconds', 'Time spent in database statements per request.', ('endpoint',))
+stage_latency = registry.histogram(
+    'pipeline_stage_duration_seconds', 'Time spent in each stage of the analytics pipelines.', ('pipeline', 'stage'))
+slow_profiles = registry.counter(
+    'slow_request_profiles_total', 'cProfile dumps written for slow requests.', ('endpoint',))
+
+@contextmanager
+def stage_timer(pipeline, stage):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        stage_latency.observe(time.perf_counter() - started, pipeline, stage)
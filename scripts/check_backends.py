@@ -0,0 +1,310 @@
+# --- scripts/check_backends.py (end-to-end API checks per storage backend) ---
+# Runs the same API checks against every storage backend: a throwaway SQLite
+# file and PostgreSQL. For PostgreSQL the checks use a scratch database on
+# the server at --postgres-url, or on a local server started with pgserver
+# (pip install pgserver psycopg2-binary; no Docker needed) when no URL is
+# given. Each backend runs in its own process because app.py binds the
+# database at import time.
+#
+#   python scripts/check_backends.py [--backends sqlite,postgresql] [--postgres-url postgresql://...]
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import uuid
+from collections import defaultdict
+from datetime import date, timedelta
+
+ROOT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+BACKENDS = ('sqlite', 'postgresql')
+
+# --- Checks (run in the child process, against DATABASE_URL) ---
+
+LEGACY_ROWS = [
+    (1, "Expense", "Food", 12.5, "legacy", "2024-01-01"),
+    (2, "Income", "Salary", 1000.0, "legacy", "2024-01-01"),
+    (3, "Expense", "Transport", 7.25, "legacy", "2024-01-02"),
+]
+
+def create_legacy_tables(url):
+    # Tables as created before dates were typed and before users existed, so
+    # app startup has to migrate them
+    from sqlalchemy import create_engine, text
+    engine = create_engine(url)
+    with engine.begin() as conn:
+        conn.execute(text('CREATE TABLE budget (id INTEGER PRIMARY KEY, category VARCHAR(80) UNIQUE, "limit" FLOAT)'))
+        conn.execute(text('INSERT INTO budget (id, category, "limit") VALUES (1, \'Rent\', 900)'))
+        conn.execute(text(
+            'CREATE TABLE "transaction" (id INTEGER PRIMARY KEY, type VARCHAR(10), category VARCHAR(80), '
+            'amount FLOAT, description VARCHAR(200), date VARCHAR(20))'
+        ))
+        for row in LEGACY_ROWS:
+            conn.execute(text(
+                'INSERT INTO "transaction" (id, type, category, amount, description, date) '
+                'VALUES (:id, :type, :category, :amount, :description, :date)'
+            ), dict(zip(('id', 'type', 'category', 'amount', 'description', 'date'), row)))
+    engine.dispose()
+
+def sample_ledger():
+    # 45 days of expenses across three categories plus two salaries
+    rows = []
+    for i in range(45):
+        day = (date(2024, 1, 3) + timedelta(days=i)).isoformat()
+        rows.append({"type": "Expense", "category": ["Food", "Transport", "Rent"][i % 3],
+                     "amount": 10 + i % 7, "description": "", "date": day})
+    rows.append({"type": "Income", "category": "Salary", "amount": 2500, "description": "", "date": "2024-01-15"})
+    rows.append({"type": "Income", "category": "Salary", "amount": 2500, "description": "", "date": "2024-02-12"})
+    return rows
+
+class Checks:
+    def __init__(self):
+        self.failures = 0
+
+    def check(self, name, ok, detail=''):
+        print(f"  {'ok  ' if ok else 'FAIL'} {name}{'' if ok else f' ({detail})'}")
+        self.failures += not ok
+
+def run_checks():
+    create_legacy_tables(os.environ['DATABASE_URL'])
+    sys.path.insert(0, ROOT_DIR)
+    import app as backend
+    client = backend.app.test_client()
+    checks = Checks()
+    check = checks.check
+
+    ledger = [{"type": t, "category": c, "amount": a, "date": d} for _, t, c, a, _, d in LEGACY_ROWS]
+    body = client.get('/transactions?limit=1000').get_json()
+    check("legacy VARCHAR dates migrated", sorted(t['date'] for t in body['transactions']) == sorted(r['date'] for r in ledger),
+          body)
+
+    response = client.post('/add', json={"type": "Expense", "category": "Food", "amount": 20, "description": "", "date": "2024-01-02"})
+    check("POST /add after migration", response.status_code == 201, response.get_data(as_text=True))
+    ledger.append({"type": "Expense", "category": "Food", "amount": 20, "date": "2024-01-02"})
+    ids = [t['id'] for t in client.get('/transactions?limit=1000').get_json()['transactions']]
+    check("id sequence continues past migrated rows", max(ids) == 4 and len(set(ids)) == 4, ids)
+    response = client.post('/add', json={"type": "Expense", "category": "Food", "amount": 1, "date": "02/01/2024"})
+    check("POST /add rejects malformed dates", response.status_code == 400, response.status_code)
+
+    rows = sample_ledger()
+    response = client.post('/transactions/bulk', json=rows + [{"type": "Expense", "category": "Food", "amount": "x", "date": "2024-01-05"}])
+    body = response.get_json()
+    check("POST /transactions/bulk (JSON)", response.status_code == 201 and body['inserted'] == len(rows) and body['rejected'] == 1, body)
+    ledger.extend(rows)
+    too_long = [{"type": "Expense", "category": "Food", "amount": 1, "description": "x" * 201, "date": "2024-01-05"},
+                {"type": "Expense", "category": "x" * 81, "amount": 1, "description": "", "date": "2024-01-05"}]
+    body = client.post('/transactions/bulk', json=too_long).get_json()
+    check("POST /transactions/bulk rejects over-long text per row", body['inserted'] == 0
+          and [e['errors'] for e in body['errors']] == [["description must be at most 200 characters"],
+                                                        ["category must be at most 80 characters"]], body)
+    csv_body = "type,category,amount,description,date\nExpense,Fun,15.5,,2024-02-10\nExpense,fun,4.5,,2024-02-11\n"
+    response = client.post('/transactions/bulk', data=csv_body, content_type='text/csv')
+    check("POST /transactions/bulk (CSV)", response.status_code == 201 and response.get_json()['inserted'] == 2, response.get_json())
+    ledger.extend([{"type": "Expense", "category": "Fun", "amount": 15.5, "date": "2024-02-10"},
+                   {"type": "Expense", "category": "fun", "amount": 4.5, "date": "2024-02-11"}])
+
+    income = sum(r['amount'] for r in ledger if r['type'] == "Income")
+    expenses = sum(r['amount'] for r in ledger if r['type'] == "Expense")
+    body = client.get('/transactions/summary').get_json()
+    check("GET /transactions/summary", body['count'] == len(ledger) and abs(body['income'] - income) < 1e-6
+          and abs(body['expenses'] - expenses) < 1e-6, body)
+
+    seen, cursor, previous = [], None, None
+    while True:
+        body = client.get('/transactions', query_string={"limit": 7, **({"cursor": cursor} if cursor else {})}).get_json()
+        seen.extend(body['transactions'])
+        cursor = body['next_cursor']
+        if not cursor:
+            break
+    order = [(t['date'], t['id']) for t in seen]
+    check("GET /transactions keyset pages", len(seen) == len(ledger) and order == sorted(order, reverse=True), len(seen))
+    import pyarrow as pa
+    rows = client.get('/transactions?limit=10').get_json()
+    columns = client.get('/transactions?limit=10', headers={"Accept": backend.COLUMNS_MIMETYPE}).get_json()
+    arrow = client.get('/transactions?limit=10', headers={"Accept": backend.ARROW_MIMETYPE})
+    arrow_rows = pa.ipc.open_stream(arrow.get_data()).read_all().to_pylist()
+    check("GET /transactions columnar formats match", [dict(zip(columns['columns'], values)) for values in zip(*columns['columns'].values())]
+          == rows['transactions'] == [dict(r, date=r['date'].isoformat()) for r in arrow_rows]
+          and columns['next_cursor'] == arrow.headers['X-Next-Cursor'] == rows['next_cursor'])
+    check("GET /transactions unacceptable format", client.get('/transactions', headers={"Accept": "text/html"}).status_code == 406)
+    body = client.get('/transactions?category=FUN&start=2024-02-01&end=2024-02-28').get_json()
+    check("GET /transactions filters", len(body['transactions']) == 2, body)
+
+    daily = client.get('/rollups/daily?type=Expense').get_json()
+    check("GET /rollups/daily totals", abs(sum(r['total'] for r in daily) - expenses) < 1e-6, len(daily))
+    for granularity in ('day', 'week', 'month'):
+        body = client.get(f'/trends?granularity={granularity}&breakdown=category&max_points=5').get_json()
+        per_category = defaultdict(float)
+        for r in daily:
+            per_category[r['category']] += r['total']
+        check(f"GET /trends {granularity}", len(body['dates']) <= 5 and abs(sum(body['total']) - expenses) < 1e-6
+              and {name: round(sum(values), 6) for name, values in body['categories'].items()}
+              == {name: round(total, 6) for name, total in per_category.items()}, body)
+    body = client.get('/trends?granularity=week&max_points=1000').get_json()
+    check("GET /trends weeks start on Monday", body['step'] == 1
+          and all(date.fromisoformat(d).weekday() == 0 for d in body['dates']), body['dates'][:3])
+    with backend.app.app_context():
+        incremental = client.get('/rollups/daily').get_json()
+        backend.rebuild_rollups()
+        check("incremental rollups match a rebuild", client.get('/rollups/daily').get_json() == incremental)
+
+    response = client.get('/transactions/export?format=csv')
+    check("GET /transactions/export csv", response.get_data(as_text=True).strip().count('\n') == len(ledger))
+    response = client.get('/transactions/export?format=ndjson')
+    check("GET /transactions/export ndjson", len(response.get_data(as_text=True).strip().split('\n')) == len(ledger))
+    # Streamed exports tear down twice; with profiling on, each must still
+    # finish and be counted once
+    backend.PROFILE_SLOW_REQUEST_MS = 0.001
+    with tempfile.TemporaryDirectory() as backend.PROFILE_DIR:
+        bodies = [client.get('/transactions/export?format=csv').get_data(as_text=True) for _ in range(2)]
+        profiles = os.listdir(backend.PROFILE_DIR)
+    backend.PROFILE_SLOW_REQUEST_MS = 0
+    exports = [line for line in client.get('/metrics').get_data(as_text=True).splitlines()
+               if line.startswith('http_requests_total{endpoint="/transactions/export"')]
+    check("GET /transactions/export with profiling", all(b.strip().count('\n') == len(ledger) for b in bodies)
+          and len(profiles) == 2 and exports == ['http_requests_total{endpoint="/transactions/export",method="GET",status="200"} 4'],
+          (profiles, exports))
+
+    first = client.get('/transactions?limit=1').get_json()['transactions'][0]
+    response = client.get('/transactions?limit=1')
+    check("ETag revalidation", client.get('/transactions?limit=1', headers={"If-None-Match": response.headers['ETag']}).status_code == 304)
+    client.post('/budget', json={"category": "Food", "limit": 100})
+    check("no Last-Modified within a second of a write", 'Last-Modified' not in client.get('/budget').headers)
+    check("DELETE /delete/<id>", client.delete(f"/delete/{first['id']}").status_code == 200
+          and client.delete(f"/delete/{first['id']}").status_code == 404)
+    ids = [t['id'] for t in client.get('/transactions?limit=2').get_json()['transactions']]
+    body = client.post('/delete/batch', json={"ids": ids + [10 ** 9]}).get_json()
+    check("POST /delete/batch", body['deleted'] == 2 and body['not_found'] == 1, body)
+
+    check("POST /budget", client.post('/budget', json={"category": "Food", "limit": 200}).status_code in (200, 201))
+    body = client.get('/budget').get_json()
+    check("GET /budget (with migrated budget)", body == [{"category": "Food", "limit": 200.0}, {"category": "Rent", "limit": 900.0}], body)
+    food_january = sum(r['amount'] for r in ledger if r['category'] == "Food" and r['date'].startswith("2024-01"))
+    body = client.get('/budget/progress?month=2024-01').get_json()
+    check("GET /budget/progress", len(body) == 2 and abs(body[0]['spent'] - food_january) < 1e-6, body)
+
+    response = client.get('/forecast?engine=fast')
+    check("GET /forecast?engine=fast", response.status_code == 200 and len(response.get_json()['forecast']) == 7,
+          response.get_data(as_text=True))
+    response = client.get('/forecast?wait=60')
+    check("GET /forecast (rf)", response.status_code == 200 and len(response.get_json()['forecast']) == 7,
+          response.get_data(as_text=True))
+    body = client.get('/forecast/batch').get_json()
+    check("GET /forecast/batch", set(body['series']) == {"Food", "Transport", "Rent"} and set(body['skipped']) == {"Fun", "fun"},
+          body.get('skipped'))
+    # The advisor's window ends at the latest transaction and its totals
+    # cover exactly the rows inside it
+    remaining = client.get('/transactions?limit=1000').get_json()['transactions']
+    window_end = max(date.fromisoformat(t['date']) for t in remaining)
+    window_start = window_end - timedelta(days=59)
+    in_window = [t for t in remaining if window_start <= date.fromisoformat(t['date']) <= window_end]
+    body = client.get('/advisor?days=60').get_json()
+    stats = body.get('stats', {})
+    check("GET /advisor", bool(body.get('advice')) and stats.get('window_start') == window_start.isoformat()
+          and stats.get('window_end') == window_end.isoformat()
+          and abs(stats['total_income'] - sum(t['amount'] for t in in_window if t['type'] == "Income")) < 1e-6
+          and abs(stats['total_expenses'] - sum(t['amount'] for t in in_window if t['type'] == "Expense")) < 1e-6, body)
+    check("GET /metrics", client.get('/metrics').status_code == 200)
+
+    # A second user shares the database but none of the data
+    alice = {"X-User-Id": "alice"}
+    check("other users start empty", client.get('/transactions/summary', headers=alice).get_json()['count'] == 0
+          and client.get('/rollups/daily', headers=alice).get_json() == [])
+    check("budgets are per user", client.post('/budget', json={"category": "Food", "limit": 5}, headers=alice).status_code == 200
+          and client.get('/budget', headers=alice).get_json() == [{"category": "Food", "limit": 5.0}]
+          and client.get('/budget').get_json()[0]['limit'] == 200.0)
+    client.post('/add', json={"type": "Expense", "category": "Food", "amount": 3, "description": "", "date": "2024-03-01"}, headers=alice)
+    alice_id = client.get('/transactions', headers=alice).get_json()['transactions'][0]['id']
+    check("users cannot delete each other's transactions", client.delete(f'/delete/{alice_id}').status_code == 404
+          and client.post('/delete/batch', json={"ids": [alice_id]}).get_json()['deleted'] == 0)
+    check("summaries stay per user", client.get('/transactions/summary').get_json()['count'] == len(ledger) - 3
+          and client.get('/transactions/summary', headers=alice).get_json()['count'] == 1)
+    check("ETags are per user", client.get('/budget').headers['ETag'] != client.get('/budget', headers=alice).headers['ETag'])
+    check("only X-User-Id selects the user", client.get('/transactions/export?format=ndjson', headers=alice)
+          .get_data(as_text=True).count('\n') == 1
+          and client.get('/transactions/export?format=ndjson&user_id=alice').get_data(as_text=True).count('\n') == len(ledger) - 3)
+    with backend.app.app_context():
+        incremental = client.get('/rollups/daily', headers=alice).get_json()
+        backend.rebuild_rollups()
+        check("per-user rollups match a rebuild", client.get('/rollups/daily', headers=alice).get_json() == incremental)
+    check("X-User-Id is validated", client.get('/transactions', headers={"X-User-Id": "x" * 65}).status_code == 400)
+    return checks.failures
+
+# --- Matrix (parent process) ---
+
+def postgres_scratch_database(server_url):
+    # Creates an empty database next to server_url; returns its URL and a
+    # cleanup callable
+    from sqlalchemy import create_engine, text
+    from sqlalchemy.engine import make_url
+    url = make_url(server_url)
+    if url.drivername == 'postgresql':
+        # Bare URLs mean psycopg2 or psycopg 3 depending on the SQLAlchemy
+        # version; pick whichever is installed
+        try:
+            import psycopg2
+            url = url.set(drivername='postgresql+psycopg2')
+        except ImportError:
+            url = url.set(drivername='postgresql+psycopg')
+    name = f"finance_check_{uuid.uuid4().hex[:8]}"
+    admin = create_engine(url, isolation_level='AUTOCOMMIT')
+    with admin.connect() as conn:
+        conn.execute(text(f'CREATE DATABASE "{name}"'))
+
+    def drop():
+        with admin.connect() as conn:
+            conn.execute(text(f'DROP DATABASE IF EXISTS "{name}" WITH (FORCE)'))
+        admin.dispose()
+    return url.set(database=name).render_as_string(hide_password=False), drop
+
+def run_backend(backend, url, workdir):
+    env = dict(os.environ, DATABASE_URL=url,
+               FORECAST_MODEL_DIR=os.path.join(workdir, f'{backend}-models'),
+               FORECAST_RETRAIN_DELAY='0')
+    print(f"\n{backend}")
+    return subprocess.run([sys.executable, os.path.abspath(__file__), '--run-checks'], env=env).returncode == 0
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the API checks against each storage backend")
+    parser.add_argument('--backends', default=','.join(BACKENDS))
+    parser.add_argument('--postgres-url', help='server to create a scratch database on (default: start pgserver)')
+    parser.add_argument('--run-checks', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.run_checks:
+        sys.exit(1 if run_checks() else 0)
+
+    results = {}
+    with tempfile.TemporaryDirectory(prefix='finance-backends-') as workdir:
+        for backend in args.backends.split(','):
+            if backend == 'sqlite':
+                results[backend] = run_backend(backend, 'sqlite:///' + os.path.join(workdir, 'check.db'), workdir)
+                continue
+            if backend != 'postgresql':
+                parser.error(f"unknown backend {backend}")
+            server = None
+            server_url = args.postgres_url
+            if server_url is None:
+                try:
+                    import pgserver
+                except ImportError:
+                    print("\npostgresql\n  skipped: pass --postgres-url or pip install pgserver psycopg2-binary")
+                    results[backend] = None
+                    continue
+                server = pgserver.get_server(os.path.join(workdir, 'pgdata'), cleanup_mode='stop')
+                server_url = server.get_uri()
+            url, drop = postgres_scratch_database(server_url)
+            try:
+                results[backend] = run_backend(backend, url, workdir)
+            finally:
+                drop()
+                if server is not None:
+                    server.cleanup()
+
+    print()
+    for backend, ok in results.items():
+        print(f"{backend:<12} {'skipped' if ok is None else 'passed' if ok else 'FAILED'}")
+    sys.exit(0 if all(ok is not False for ok in results.values()) else 1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+# --- serve.py (production server: gunicorn with several worker processes) ---
+# `python app.py` runs Flask's single-process development server. This runs
+# the same app under gunicorn: --workers processes with --threads threads
+# each, so a slow request only ties up one thread, plus a pool of
+# --analytics-processes per worker for model fits and batch forecasts.
+#
+# The app is imported once in the master, which runs the startup migrations
+# and loads the analytics stack before forking, so workers start warm and
+# never race each other on the schema. Each worker reports its own /metrics.
+#
+#   python serve.py [--bind 127.0.0.1:5000] [--workers 3] [--threads 4] [--analytics-processes 1]
+
+import argparse
+import multiprocessing
+import os
+import sys
+
+try:
+    from gunicorn.app.base import BaseApplication
+except ImportError:  # gunicorn is POSIX-only
+    BaseApplication = None
+
+def default_workers():
+    return int(os.environ.get('WEB_CONCURRENCY', 2 * multiprocessing.cpu_count() + 1))
+
+def post_fork(server, worker):
+    # Connections the master opened while migrating must not be shared
+    import app
+    with app.app.app_context():
+        app.db.engine.dispose(close=False)
+
+if BaseApplication is not None:
+    class FinanceServer(BaseApplication):
+        def __init__(self, options):
+            self.options = options
+            super().__init__()
+
+        def load_config(self):
+            for key, value in self.options.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            import forecasting
+            forecasting.preload()
+            import app
+            return app.app
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the Finance Assistant API with gunicorn")
+    parser.add_argument('--bind', default=os.environ.get('BIND', '127.0.0.1:5000'))
+    parser.add_argument('--workers', type=int, default=default_workers(), help='worker processes (default 2 x cores + 1)')
+    parser.add_argument('--threads', type=int, default=4, help='request threads per worker')
+    parser.add_argument('--analytics-processes', type=int, default=1,
+                        help='analytics pool size per worker, 0 to run analytics in the request thread')
+    parser.add_argument('--timeout', type=int, default=120, help='seconds before a silent worker is restarted')
+    args = parser.parse_args()
+    if BaseApplication is None:
+        sys.exit("serve.py needs gunicorn, which does not run on Windows; use `python app.py` there")
+
+    # app.py reads these at import time
+    os.environ['ANALYTICS_PROCESSES'] = str(args.analytics_processes)
+    os.environ['PRELOAD_ANALYTICS'] = '0'  # loaded in the master instead, see load()
+    FinanceServer({
+        'bind': args.bind,
+        'workers': args.workers,
+        'threads': args.threads,
+        'worker_class': 'gthread',
+        'timeout': args.timeout,
+        'preload_app': True,
+        'post_fork': post_fork,
+    }).run()
+
+if __name__ == '__main__':
+    main()
@@ -2,8 +2,10 @@
 
 import streamlit as st
 import requests
+from requests.adapters import HTTPAdapter
 import pandas as pd
 import plotly.express as px
+import pyarrow as pa
 from datetime import datetime, timedelta
 
 st.set_page_config(page_title="Finance Assistant", layout="wide")
@@ -11,6 +13,96 @@ st.set_page_config(page_title="Finance Assistant", layout="wide")
 # Base URL for your backend
 backend_url = "http://127.0.0.1:5000"
 
+# Seconds a cached GET is reused without asking the backend; after that it is
+# revalidated with If-None-Match. Writes from this app clear it at once.
+CACHE_TTL = 15
+ETAG_STORE_SIZE = 256
+DEFAULT_USER = "default"
+# Points per trend chart; longer ranges are summed into wider periods
+TREND_MAX_POINTS = 400
+# Transaction pages come back as compressed Arrow IPC, decoded straight into a
+# DataFrame instead of building one from a list of JSON objects
+ARROW_MIMETYPE = "application/vnd.apache.arrow.stream"
+
+@st.cache_resource
+def get_session():
+    # One keep-alive connection pool shared by every rerun and browser tab
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+@st.cache_resource
+def get_etag_store():
+    # (user, path, params, accept) -> (etag, body) of the last 200 response
+    return {}
+
+def current_user():
+    # The name entered on the Welcome page picks the ledger; everyone else
+    # shares the backend's default one. The widget's value is read first so
+    # the sidebar is right on the rerun that changed it.
+    name = st.session_state.get("name_input", st.session_state.get("user_name", ""))
+    return name.strip() or DEFAULT_USER
+
+class UncachedResponse(Exception):
+    pass
+
+def decode_body(response):
+    # Arrow responses carry a single table; the page cursor travels in a header
+    if response.headers.get("Content-Type", "").startswith(ARROW_MIMETYPE):
+        return {
+            "frame": pa.ipc.open_stream(response.content).read_pandas(),
+            "next_cursor": response.headers.get("X-Next-Cursor")
+        }
+    return response.json()
+
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+def cached_get(path, params=None, user=DEFAULT_USER, accept="application/json"):
+    store = get_etag_store()
+    key = (user, path, tuple(sorted((params or {}).items())), accept)
+    headers = {"X-User-Id": user, "Accept": accept}
+    if key in store:
+        headers["If-None-Match"] = store[key][0]
+    response = get_session().get(f"{backend_url}{path}", params=params, headers=headers)
+    if response.status_code == 304:
+        return store[key][1]
+    if response.status_code != 200:
+        # Errors and "still training" answers must not stick in the cache
+        raise UncachedResponse(response.status_code, response.json())
+    body = decode_body(response)
+    if "ETag" in response.headers:
+        store.pop(key, None)
+        store[key] = (response.headers["ETag"], body)
+        while len(store) > ETAG_STORE_SIZE:
+            store.pop(next(iter(store)))
+    return body
+
+def api_get(path, params=None, accept="application/json"):
+    # Returns (status_code, body); reruns with unchanged data hit the cache
+    try:
+        return 200, cached_get(path, params, current_user(), accept)
+    except UncachedResponse as e:
+        return e.args
+
+def api_post(path, **kwargs):
+    headers = {"X-User-Id": current_user(), **kwargs.pop("headers", {})}
+    response = get_session().post(f"{backend_url}{path}", headers=headers, **kwargs)
+    # Anything cached may now be stale
+    cached_get.clear()
+    return response
+
+def export_download(params, export_format):
+    # Downloads go through this app so the backend sees X-User-Id; the
+    # export is only fetched once the button is clicked
+    user = current_user()
+    def fetch():
+        response = get_session().get(f"{backend_url}/transactions/export",
+                                     params={**params, "format": export_format}, headers={"X-User-Id": user})
+        response.raise_for_status()
+        return response.content
+    return fetch
+
 # --- Sidebar Navigation ---
 st.sidebar.title(" Navigation")
 pages = [
@@ -24,6 +116,7 @@ pages = [
     " About"
 ]
 selected_page = st.sidebar.radio("Go to", pages)
+st.sidebar.caption(f"Ledger: {current_user()}")
 
 if selected_page == " Welcome":
     # Set background color and font styles
@@ -64,7 +157,10 @@ if selected_page == " Welcome":
     col1, col2 = st.columns([2, 3])
     
     with col1:
-        user = st.text_input("", placeholder="Add your name", key="name_input")
+        user = st.text_input("", value=st.session_state.get("user_name", ""),
+                             placeholder="Add your name", key="name_input").strip()
+        # The widget's own state is dropped when another page is shown
+        st.session_state.user_name = user
         if user:
             st.markdown(
                 f'<p style="color:#006400; font-size:20px;">👋 Welcome, {user}! Manage your money smarter.</p>',
@@ -116,10 +212,32 @@ elif selected_page == " Add Transaction":
             "date": str(date)
         }
         try:
-            r = requests.post(f"{backend_url}/add", json=data)
+            r = api_post("/add", json=data)
             st.success("✅ Transaction added!")
         except Exception as e:
             st.error(f"Error: {e}")
+
+    # Bulk import from a bank statement export
+    with st.expander(" Import from CSV"):
+        st.caption("Columns: type, category, amount, description, date (YYYY-MM-DD)")
+        upload = st.file_uploader("CSV file", type="csv")
+        if upload is not None and st.button("Import"):
+            try:
+                with st.spinner("Importing transactions..."):
+                    r = api_post(
+                        "/transactions/bulk",
+                        files={"file": (upload.name, upload.getvalue(), "text/csv")}
+                    )
+                result = r.json()
+                if "error" in result:
+                    st.error(f"Error: {result['error']}")
+                else:
+                    st.success(f"✅ Imported {result['inserted']} transactions.")
+                    if result["errors"]:
+                        st.warning(f"{result['rejected']} rows were skipped:")
+                        st.dataframe(pd.DataFrame(result["errors"]), hide_index=True)
+            except Exception as e:
+                st.error(f"Error: {e}")
 # --- Transaction History ---
 elif selected_page == " Transaction History":
     st.header(" Transaction History")
@@ -135,37 +253,50 @@ elif selected_page == " Transaction History":
                                       value=datetime.now() - timedelta(days=30))
             end_date = st.date_input("End Date", value=datetime.now())
     
+    filters = {
+        "start": str(start_date),
+        "end": str(end_date),
+        "type": filter_type,
+        "category": category_filter
+    }
+    page_size = st.selectbox("Rows per page", [50, 100, 250, 500], index=1)
+
+    # Cursor stack for the current filters; reset whenever they change
+    page_key = (tuple(filters.values()), page_size)
+    if st.session_state.get("history_page_key") != page_key:
+        st.session_state.history_page_key = page_key
+        st.session_state.history_cursors = [None]
+    cursors = st.session_state.history_cursors
+
     try:
-        # Fetch transactions with loading spinner
+        # Fetch only the page being displayed
         with st.spinner("Loading transactions..."):
-            res = requests.get(f"{backend_url}/transactions")
-            txns = res.json()
-            if isinstance(txns, dict):
-                txns = txns.get("transactions", [])
-            
-            df = pd.DataFrame(txns)
+            params = dict(filters, limit=page_size)
+            if cursors[-1]:
+                params["cursor"] = cursors[-1]
+            _, page = api_get("/transactions", params, accept=ARROW_MIMETYPE)
+            _, summary = api_get("/transactions/summary", filters)
+            df = page.get("frame", pd.DataFrame())
             
             if not df.empty:
-                # Convert date and filter
                 df['date'] = pd.to_datetime(df['date'])
-                df = df[(df['date'] >= pd.to_datetime(start_date)) & 
-                        (df['date'] <= pd.to_datetime(end_date))]
-                
-                if filter_type != "All":
-                    df = df[df['type'] == filter_type]
-                
-                if category_filter:
-                    df = df[df['category'].str.contains(category_filter, case=False, na=False)]
                 
                 # Display summary stats
-                st.metric("Total Transactions", len(df))
+                st.metric("Total Transactions", summary["count"])
                 
                 col1, col2 = st.columns(2)
-                income = df[df['type'] == 'Income']['amount'].sum()
-                expenses = df[df['type'] == 'Expense']['amount'].sum()
+                col1.metric("Total Income", f"₹{summary['income']:,.2f}")
+                col2.metric("Total Expenses", f"₹{summary['expenses']:,.2f}")
                 
-                col1.metric("Total Income", f"₹{income:,.2f}")
-                col2.metric("Total Expenses", f"₹{expenses:,.2f}")
+                # Page navigation
+                nav1, nav2, nav3 = st.columns([1, 2, 1])
+                nav2.caption(f"Page {len(cursors)}")
+                if len(cursors) > 1 and nav1.button("⬅️ Previous"):
+                    cursors.pop()
+                    st.rerun()
+                if page.get("next_cursor") and nav3.button("Next ➡️"):
+                    cursors.append(page["next_cursor"])
+                    st.rerun()
                 
                 # Add delete functionality
                 st.subheader("Manage Transactions")
@@ -191,31 +322,28 @@ elif selected_page == " Transaction History":
                     if st.button("🗑️ Delete Selected Transactions", type="primary"):
                         with st.spinner("Deleting transactions..."):
                             deleted_count = 0
-                            for _, row in selected_rows.iterrows():
-                                try:
-                                    # Assuming your backend has a delete endpoint
-                                    response = requests.delete(
-                                        f"{backend_url}/transactions/{row['id']}"
-                                    )
-                                    if response.status_code == 200:
-                                        deleted_count += 1
-                                except Exception:
-                                    continue
+                            try:
+                                response = api_post(
+                                    "/delete/batch",
+                                    json={"ids": selected_rows["id"].astype(int).tolist()}
+                                )
+                                if response.status_code == 200:
+                                    deleted_count = response.json()["deleted"]
+                            except Exception:
+                                pass
                             
                             if deleted_count > 0:
                                 st.success(f"✅ Successfully deleted {deleted_count} transactions!")
-                                st.experimental_rerun()
+                                st.rerun()
                             else:
                                 st.error("Failed to delete transactions")
                 
-                # Add download button
-                csv = df.to_csv(index=False).encode('utf-8')
-                st.download_button(
-                    label="📥 Download as CSV",
-                    data=csv,
-                    file_name='transactions.csv',
-                    mime='text/csv'
-                )
+                # Downloads of every filtered row, fetched on click
+                dl1, dl2 = st.columns(2)
+                dl1.download_button("📥 Download as CSV", export_download(filters, "csv"),
+                                    file_name="transactions.csv", mime="text/csv", on_click="ignore")
+                dl2.download_button("📥 Download as NDJSON", export_download(filters, "ndjson"),
+                                    file_name="transactions.ndjson", mime="application/x-ndjson", on_click="ignore")
             else:
                 st.info("No transactions found for the selected filters.")
     except Exception as e:
@@ -248,8 +376,8 @@ elif selected_page == " Budget Management":
             else:
                 try:
                     with st.spinner("Saving budget..."):
-                        r = requests.post(
-                            f"{backend_url}/budget", 
+                        r = api_post(
+                            "/budget", 
                             json={"category": category.strip(), "limit": limit}
                         )
                         if r.status_code == 200:
@@ -263,23 +391,17 @@ elif selected_page == " Budget Management":
         st.subheader("📊 Budget Progress")
         try:
             with st.spinner("Loading budget data..."):
-                # Fetch data
-                txns = requests.get(f"{backend_url}/transactions").json()
-                budgets = requests.get(f"{backend_url}/budget").json()
-                
-                if isinstance(txns, dict):
-                    txns = txns.get("transactions", [])
+                # Budgets are monthly, so default to the current month
+                months = pd.period_range(end=pd.Timestamp.now(), periods=12, freq="M")[::-1]
+                period = st.selectbox("Period", ["All time"] + [str(m) for m in months], index=1)
+                params = {} if period == "All time" else {"month": period}
                 
-                df_txn = pd.DataFrame(txns)
-                df_budget = pd.DataFrame(budgets)
+                # One row per budget category, computed by the backend
+                _, budget_rows = api_get("/budget/progress", params)
+                progress = pd.DataFrame(budget_rows)
                 
-                if not df_txn.empty and not df_budget.empty:
-                    # Process data
-                    spent = df_txn[df_txn["type"] == "Expense"].groupby("category")["amount"].sum().reset_index()
-                    progress = pd.merge(df_budget, spent, on="category", how="left").fillna(0)
-                    progress["spent"] = progress["amount"]
-                    progress["remaining"] = progress["limit"] - progress["spent"]
-                    progress["percent"] = (progress["spent"] / progress["limit"]) * 100
+                if not progress.empty:
+                    progress["percent"] = progress["percent"].fillna(0)
                     
                     # Display progress for each category
                     for _, row in progress.iterrows():
@@ -301,23 +423,31 @@ elif selected_page == " Budget Management":
                             
                             st.divider()
                 else:
-                    st.info("Add transactions and budgets to view progress.")
+                    st.info("Add budgets to view progress.")
         except Exception as e:
             st.error(f"❌ Error: {str(e)}")
 
 # --- Expense Trends ---
 elif selected_page == " Expense Trends":
-    st.header(" Daily Expense Trends")
+    st.header(" Expense Trends")
+    col1, col2 = st.columns(2)
+    granularity = col1.radio("Group by", ["day", "week", "month"], horizontal=True, format_func=str.capitalize)
+    by_category = col2.checkbox("Split by category")
     try:
-        txns = requests.get(f"{backend_url}/transactions").json()
-        if isinstance(txns, dict):
-            txns = txns.get("transactions", [])
-        df = pd.DataFrame(txns)
-        if not df.empty:
-            df = df[df["type"] == "Expense"]
-            df["date"] = pd.to_datetime(df["date"])
-            df_grouped = df.groupby("date")["amount"].sum().reset_index()
-            fig = px.line(df_grouped, x="date", y="amount", title="Daily Expenses")
+        # The backend aggregates and downsamples, so the chart stays small
+        # however long the history is
+        params = {"granularity": granularity, "max_points": TREND_MAX_POINTS}
+        if by_category:
+            params["breakdown"] = "category"
+        _, trend = api_get("/trends", params)
+        if trend.get("dates"):
+            series = trend["categories"] if by_category else {"Total": trend["total"]}
+            df = pd.DataFrame(series, index=pd.to_datetime(trend["dates"]))
+            df.index.name = "date"
+            df = df.reset_index().melt(id_vars="date", var_name="category", value_name="amount")
+            period = granularity if trend["step"] == 1 else f"{trend['step']} {granularity}s"
+            fig = px.line(df, x="date", y="amount", color="category" if by_category else None,
+                          title=f"Expenses per {period}")
             st.plotly_chart(fig)
         else:
             st.info("No expenses yet.")
@@ -333,13 +463,25 @@ elif selected_page == " Forecast & Advice":
     
     with tab1:
         st.header(" 7-Day Spending Forecast")
+        engine = st.radio(
+            "Model", ["rf", "fast"], horizontal=True,
+            format_func={"rf": "Random Forest blend", "fast": "Fast (closed-form)"}.get
+        )
         try:
             with st.spinner("Generating forecast..."):
-                response = requests.get(f"{backend_url}/forecast")
-                if response.status_code == 200:
-                    forecast_data = response.json()
-                    if forecast_data and not isinstance(forecast_data, dict):
-                        df = pd.DataFrame(forecast_data)
+                # Give a retrain triggered by recent writes a moment to finish
+                status, forecast_data = api_get("/forecast", {"wait": 5, "engine": engine})
+                if status == 202:
+                    st.info("⏳ The forecast model is training. Refresh in a few seconds.")
+                elif status == 400:
+                    st.warning("Not enough data to generate forecast. Add more transactions.")
+                elif status == 200:
+                    caption = f"Model trained at {forecast_data['trained_at']}"
+                    if forecast_data["stale"]:
+                        caption += " · updating with your latest transactions"
+                    st.caption(caption)
+                    if forecast_data["forecast"]:
+                        df = pd.DataFrame(forecast_data["forecast"])
                         df['date'] = pd.to_datetime(df['date'])
                         
                         # Display forecast chart
@@ -375,17 +517,39 @@ elif selected_page == " Forecast & Advice":
                     else:
                         st.warning("Not enough data to generate forecast. Add more transactions.")
                 else:
-                    st.error(f"Error generating forecast: {response.text}")
+                    st.error(f"Error generating forecast: {forecast_data}")
         except Exception as e:
             st.error(f"Error: {str(e)}")
+        
+        with st.expander(" Forecast by category"):
+            try:
+                status, batch = api_get("/forecast/batch")
+                if status == 200 and batch["series"]:
+                    df = pd.concat(
+                        [pd.DataFrame(rows).assign(category=name) for name, rows in batch["series"].items()]
+                    )
+                    fig = px.line(
+                        df, x="date", y="predicted_amount", color="category",
+                        title="7-Day Forecast per Category",
+                        labels={"date": "Date", "predicted_amount": "Predicted Amount (₹)"}
+                    )
+                    st.plotly_chart(fig, use_container_width=True)
+                    if batch["skipped"]:
+                        st.caption("Not enough history yet: " + ", ".join(batch["skipped"]))
+                else:
+                    st.info("Not enough data for per-category forecasts yet.")
+            except Exception as e:
+                st.error(f"Error: {str(e)}")
     
     with tab2:
         st.header(" Personalized Financial Advice")
+        window_days = st.selectbox(
+            "Analysis window", [30, 90, 180, 365], format_func=lambda d: f"Last {d} days"
+        )
         try:
             with st.spinner("Analyzing your spending patterns..."):
-                response = requests.get(f"{backend_url}/advisor")
-                if response.status_code == 200:
-                    advice_data = response.json()
+                status, advice_data = api_get("/advisor", {"days": window_days})
+                if status == 200:
                     
                     # Display advice
                     st.markdown(
@@ -430,7 +594,7 @@ elif selected_page == " Forecast & Advice":
                             unsafe_allow_html=True
                         )
                 else:
-                    st.error(f"Error getting advice: {response.text}")
+                    st.error(f"Error getting advice: {advice_data}")
         except Exception as e:
             st.error(f"Error: {str(e)}")
 # --- Monthly Salary ---
@@ -450,7 +614,7 @@ elif selected_page == " Monthly Salary":
                 "description": "Monthly Salary",
                 "date": str(date)
             }
-            requests.post(f"{backend_url}/add", json=data)
+            api_post("/add", json=data)
             st.success("✅ Salary added.")
         except Exception as e:
             st.error(f"Error: {e}")